@@ -0,0 +1,68 @@
+# MinHash / LSH near-duplicate detection over app source code.
+#
+# REFRESH_APP_SIMILARITY in STORED_PROCEDURES.md inlines these functions (Python procedures cannot import from the
+# repo); keep the two copies identical. The local backend runs them over the fixture app sources.
+
+import hashlib
+import json
+import re
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+MIN_SIMILARITY = 0.7
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+PERMUTATIONS = np.random.RandomState(42).randint(1, 1 << 31, size=(2, NUM_PERM), dtype=np.uint64)
+
+
+def shingle_hashes(code):
+    code = re.sub(r'#[^\n]*', '', code.lower())
+    tokens = re.findall(r'[a-z_][a-z0-9_]*|\d+|\S', code)
+    shingles = {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return np.array([int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), 'little') for s in shingles], dtype=np.uint64)
+
+
+def minhash(hashes):
+    a, b = PERMUTATIONS
+    return (((hashes[:, None] * a + b) % MERSENNE_PRIME) & MAX_HASH).min(axis=0)
+
+
+def lsh_clusters(signatures):
+    parent = list(range(len(signatures)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(BANDS):
+        buckets = {}
+        for i, signature in enumerate(signatures):
+            buckets.setdefault(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes(), []).append(i)
+        for members in buckets.values():
+            for j in members[1:]:
+                if np.mean(signatures[members[0]] == signatures[j]) >= MIN_SIMILARITY:
+                    parent[find(j)] = find(members[0])
+    return [find(i) for i in range(len(signatures))]
+
+
+def cluster_apps(apps):
+    # apps: LOCATION, CONTENT_HASH, MINHASH (JSON array), ordered oldest first so each cluster's first app is its original
+    contents = apps.drop_duplicates('CONTENT_HASH').reset_index(drop=True)
+    matrix = np.array([json.loads(signature) for signature in contents['MINHASH']], dtype=np.uint64)
+    roots = dict(zip(contents['CONTENT_HASH'], lsh_clusters(matrix)))
+    apps = apps.assign(ROOT=apps['CONTENT_HASH'].map(roots))
+    representatives = apps.groupby('ROOT').first()
+    content_index = {content_hash: i for i, content_hash in enumerate(contents['CONTENT_HASH'])}
+    apps['CLUSTER_ID'] = apps['ROOT'].map(representatives['LOCATION'])
+    apps['CLUSTER_SIZE'] = apps.groupby('ROOT')['LOCATION'].transform('size')
+    apps['SIMILARITY'] = [
+        float(np.mean(matrix[content_index[content_hash]] == matrix[content_index[representatives.at[root, 'CONTENT_HASH']]]))
+        for content_hash, root in zip(apps['CONTENT_HASH'], apps['ROOT'])
+    ]
+    return apps
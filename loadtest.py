@@ -0,0 +1,350 @@
+# Concurrent-session load test for the dashboard, built on Streamlit's AppTest and the local DuckDB backend.
+#
+#   python loadtest.py --sessions 1,4,8,16 --steps 20
+#
+# Each level starts N simulated viewers at once. Every viewer loads the app and then runs a random script of
+# interactions (toggle PS/SD, switch filters, keyword and semantic searches, sort, page, open the editor, look up
+# similar apps), timing each rerun. All viewers share one process, and therefore one set of st.cache_data / st.cache_resource
+# caches, like a single Streamlit container. Per level the harness reports rerun latency percentiles, how many
+# loader calls were served without a warehouse query, the shared cache footprint, and resident memory per
+# additional session. Unless --cold is given, an unmeasured warm-up fills the caches first, so the per-session
+# memory slope is fitted on warm levels only.
+
+import argparse
+import ctypes
+import ctypes.util
+import gc
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('INVENTORY_BACKEND', 'local')
+os.environ.setdefault('INVENTORY_SNAPSHOT_DIR', tempfile.mkdtemp(prefix='inventory_loadtest_snapshot_'))
+os.environ.setdefault('INVENTORY_LOCAL_STAGE_DIR', tempfile.mkdtemp(prefix='inventory_loadtest_stages_'))
+
+import numpy as np
+import psutil
+from streamlit import config
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.caching import get_data_cache_stats_provider, get_resource_cache_stats_provider
+from streamlit.testing.v1 import AppTest
+
+import local_backend
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app.py')
+LOADER_COMPONENTS = ['load_user_directory', 'load_apps', 'load_metadata', 'load_usage', 'load_health', 'load_clusters']
+SEARCH_TERMS = ['dashboard', 'cost', 'usage', 'migration', 'demo', 'sales', 'pipeline', 'forecast', 'xyz']
+SEMANTIC_QUERIES = ['apps that monitor warehouse cost', 'customer health dashboards', 'migration readiness assessment',
+                    'forecast consumption and revenue', 'data quality alerts']
+EDIT_LABEL = "✏️ Select app to edit metadata"
+SIMILAR_LABEL = "Select app to find similar apps"
+
+
+def make_apptest_thread_safe():
+    # AppTest patches process-wide state for the duration of each run (a mock Runtime, the global.appTest option,
+    # a fresh ScriptCache) and resets it afterwards, which breaks any run still in flight on another thread. Pin the
+    # option, keep the most recently installed Runtime visible to every session, and compile the script once like
+    # a real server does (concurrent compiles also trip CPython).
+    config.set_option('global.appTest', True)
+    latest = {}
+    bytecode, compile_lock = {}, threading.Lock()
+    get_bytecode = ScriptCache.get_bytecode
+
+    def shared_bytecode(self, script_path):
+        with compile_lock:
+            if script_path not in bytecode:
+                bytecode[script_path] = get_bytecode(self, script_path)
+            return bytecode[script_path]
+
+    def instance(cls):
+        if cls._instance is not None:
+            latest['runtime'] = cls._instance
+        if 'runtime' not in latest:
+            raise RuntimeError("Runtime hasn't been created!")
+        return latest['runtime']
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or 'runtime' in latest)
+    ScriptCache.get_bytecode = shared_bytecode
+
+
+def rss_mb():
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def settle_memory():
+    # Hand freed heap pages back to the OS (glibc only), so RSS deltas count live memory, not allocator slack
+    gc.collect()
+    libc = ctypes.util.find_library('c')
+    malloc_trim = getattr(ctypes.CDLL(libc), 'malloc_trim', None) if libc else None
+    if malloc_trim:
+        malloc_trim(0)
+
+
+def find_widget(widgets, label):
+    return next((widget for widget in widgets if widget.label == label), None)
+
+
+def toggle_ps_only(at, rng):
+    toggle = at.sidebar.toggle[0]
+    toggle.set_value(not toggle.value)
+
+
+def switch_filter(at, rng):
+    at.sidebar.radio[0].set_value(rng.choice(at.sidebar.radio[0].options))
+
+
+def pick_filter_value(at, rng):
+    selectbox = next((widget for widget in at.sidebar.selectbox if widget.label.startswith("Select ")), None)
+    if selectbox is None or not selectbox.options:
+        return False
+    selectbox.set_value(rng.choice(selectbox.options))
+
+
+def search(at, rng):
+    at.sidebar.text_input[0].input(rng.choice(SEARCH_TERMS))
+
+
+def semantic_search(at, rng):
+    at.sidebar.toggle[1].set_value(True)
+    at.sidebar.text_input[0].input(rng.choice(SEMANTIC_QUERIES))
+
+
+def clear_search(at, rng):
+    if not at.sidebar.text_input[0].value:
+        return False
+    at.sidebar.toggle[1].set_value(False)
+    at.sidebar.text_input[0].input("")
+
+
+def sort(at, rng):
+    find_widget(at.selectbox, "Sort by").set_value(rng.choice(find_widget(at.selectbox, "Sort by").options))
+
+
+def next_page(at, rng):
+    page = next((widget for widget in at.number_input if widget.label.startswith("Page (of")), None)
+    if page is None or page.value >= page.max:
+        return False
+    page.increment()
+
+
+def open_editor(at, rng):
+    editor = find_widget(at.selectbox, EDIT_LABEL)
+    if editor is None or len(editor.options) < 2:
+        return False
+    editor.set_value(rng.choice(editor.options[1:]))
+
+
+def find_similar(at, rng):
+    similar = find_widget(at.selectbox, SIMILAR_LABEL)
+    if similar is None or len(similar.options) < 2:
+        return False
+    similar.set_value(rng.choice(similar.options[1:]))
+
+
+ACTIONS = [
+    (toggle_ps_only, 1),
+    (switch_filter, 3),
+    (pick_filter_value, 3),
+    (search, 3),
+    (semantic_search, 2),
+    (clear_search, 2),
+    (sort, 2),
+    (next_page, 2),
+    (open_editor, 2),
+    (find_similar, 1),
+]
+
+
+def run_session(session_index, steps, seed, think_time, results, apps):
+    rng = random.Random(seed + session_index)
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    apps[session_index] = at
+    action = None
+    for step in range(steps + 1):
+        if step:
+            time.sleep(think_time * rng.random())
+            action = rng.choices([action for action, _ in ACTIONS], weights=[weight for _, weight in ACTIONS])[0]
+            try:
+                if action(at, rng) is False:
+                    continue
+            except (AttributeError, IndexError, ValueError):
+                continue
+        start = time.perf_counter()
+        try:
+            at.run()
+            error = bool(at.exception)
+        except Exception:
+            error = True
+        results.append({'session': session_index, 'action': action.__name__ if action else 'initial_load', 'ms': (time.perf_counter() - start) * 1000, 'error': error})
+        if error:
+            break
+
+
+def sample_peak_rss(stop, peak):
+    while not stop.is_set():
+        peak[0] = max(peak[0], rss_mb())
+        time.sleep(0.02)
+
+
+def cache_bytes():
+    by_cache = {}
+    for provider in (get_data_cache_stats_provider(), get_resource_cache_stats_provider()):
+        stats = [stat for family in provider.get_stats().values() for stat in family]
+        for stat in stats:
+            name = stat.cache_name.rsplit('.', 1)[-1]
+            by_cache[name] = by_cache.get(name, 0) + stat.byte_length
+    return by_cache
+
+
+def cache_misses(query_log):
+    misses = {}
+    for entry in query_log:
+        tag = json.loads(entry['query_tag']) if entry['query_tag'] else {}
+        if tag.get('phase') == 'cache_miss':
+            misses[tag['component']] = misses.get(tag['component'], 0) + 1
+    return misses
+
+
+def loader_hit_ratios(misses, reruns):
+    return {component: {'calls': reruns, 'misses': misses.get(component, 0), 'hit_pct': 100.0 * (reruns - misses.get(component, 0)) / reruns if reruns else None}
+            for component in LOADER_COMPONENTS}
+
+
+def warm_up(steps, seed):
+    # Load both the PS/SD and the all-apps datasets first
+    at = AppTest.from_file(APP_PATH, default_timeout=300).run()
+    for _ in range(2):
+        toggle_ps_only(at, None)
+        at.run()
+    # Two concurrent sessions with their own scripts, so the first concurrent level does not pay for one-off growth
+    # (per-thread allocator arenas, first semantic searches)
+    results = []
+    threads = [threading.Thread(target=run_session, args=(-1 - i, steps, seed, 0.0, results, [None, None])) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    del at
+    gc.collect()
+    return results
+
+
+def run_level(sessions, steps, seed, think_time):
+    database = local_backend.get_local_database()
+    log_start = len(database.query_log)
+    results, apps = [], [None] * sessions
+    settle_memory()
+    start_mb = rss_mb()
+    stop, peak = threading.Event(), [start_mb]
+    sampler = threading.Thread(target=sample_peak_rss, args=(stop, peak), daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=run_session, args=(i, steps, seed, think_time, results, apps)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    sampler.join()
+    settle_memory()
+    resident_mb = rss_mb()
+    with database.log_lock:
+        query_log = database.query_log[log_start:]
+    clean_reruns = [result for result in results if not result['error']]
+    latencies = np.array([result['ms'] for result in clean_reruns]) if clean_reruns else np.array([0.0])
+    by_action = {}
+    for result in clean_reruns:
+        by_action.setdefault(result['action'], []).append(result['ms'])
+    report = {
+        'sessions': sessions,
+        'reruns': len(results),
+        'errors': len(results) - len(clean_reruns),
+        'elapsed_s': elapsed,
+        'reruns_per_s': len(results) / elapsed if elapsed else None,
+        'latency_ms': {f"p{p}": float(np.percentile(latencies, p)) for p in (50, 90, 95, 99)} | {'max': float(latencies.max())},
+        'latency_by_action_ms': {action: {'count': len(values), 'p50': float(np.percentile(values, 50)), 'p95': float(np.percentile(values, 95))}
+                                 for action, values in sorted(by_action.items())},
+        'warehouse_queries': len(query_log),
+        'loader_hits': loader_hit_ratios(cache_misses(query_log), len(clean_reruns)),
+        'other_cache_misses': {component: count for component, count in cache_misses(query_log).items() if component not in LOADER_COMPONENTS},
+        'cache_mb': {name: size / 2**20 for name, size in sorted(cache_bytes().items())},
+        'start_rss_mb': start_mb,
+        'peak_rss_mb': peak[0],
+        'resident_rss_mb': resident_mb,
+        'peak_mb_per_session': (peak[0] - start_mb) / sessions,
+        'resident_mb_per_session': (resident_mb - start_mb) / sessions,
+    }
+    del apps
+    gc.collect()
+    return report
+
+
+def print_report(report):
+    latency = report['latency_ms']
+    print(f"\n=== {report['sessions']} session(s): {report['reruns']} reruns in {report['elapsed_s']:.1f}s "
+          f"({report['reruns_per_s']:.1f}/s), {report['errors']} errors, {report['warehouse_queries']} warehouse queries")
+    print(f"rerun latency ms  p50 {latency['p50']:.0f}  p90 {latency['p90']:.0f}  p95 {latency['p95']:.0f}  p99 {latency['p99']:.0f}  max {latency['max']:.0f}")
+    for action, stats in report['latency_by_action_ms'].items():
+        print(f"  {action:<20} n={stats['count']:<5} p50 {stats['p50']:>7.0f}  p95 {stats['p95']:>7.0f}")
+    print("loader calls served without a warehouse query:")
+    for component, stats in report['loader_hits'].items():
+        hit_pct = f"{stats['hit_pct']:.1f}%" if stats['hit_pct'] is not None else "n/a"
+        print(f"  {component:<20} {hit_pct:>7}  ({stats['misses']} misses / {stats['calls']} calls)")
+    if report['other_cache_misses']:
+        print(f"other cache misses: {', '.join(f'{component} {count}' for component, count in sorted(report['other_cache_misses'].items()))}")
+    print(f"shared cache MB: {sum(report['cache_mb'].values()):.1f} "
+          f"({', '.join(f'{name} {size:.1f}' for name, size in report['cache_mb'].items())})")
+    print(f"memory MB  start {report['start_rss_mb']:.0f}  peak {report['peak_rss_mb']:.0f}  resident {report['resident_rss_mb']:.0f}  "
+          f"per session: peak {report['peak_mb_per_session']:.1f}  resident {report['resident_mb_per_session']:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Streamlit App Inventory")
+    parser.add_argument('--sessions', default='1,4,8', help="Comma-separated concurrency levels, run in order")
+    parser.add_argument('--steps', type=int, default=20, help="Interactions per session after the initial load")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Maximum random pause between interactions, in seconds")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--cold', action='store_true', help="Clear Streamlit caches before each level")
+    parser.add_argument('--json', help="Write the per-level reports to this file")
+    args = parser.parse_args()
+
+    make_apptest_thread_safe()
+    local_backend.get_local_database()
+    gc.collect()
+    baseline_mb = rss_mb()
+    print(f"baseline RSS {baseline_mb:.0f} MB (Python, Streamlit and the local database loaded)")
+
+    if not args.cold:
+        results = warm_up(args.steps, args.seed)
+        print(f"warm-up: {len(results)} reruns, {sum(result['error'] for result in results)} errors (not measured)")
+
+    reports = []
+    for sessions in [int(level) for level in args.sessions.split(',')]:
+        if args.cold:
+            import streamlit as st
+            st.cache_data.clear()
+            st.cache_resource.clear()
+        report = run_level(sessions, args.steps, args.seed, args.think_time)
+        print_report(report)
+        reports.append(report)
+
+    if args.cold:
+        print("\nno per-session memory slope with --cold: every level includes cache warm-up")
+    elif len(reports) > 1:
+        sessions = np.array([report['sessions'] for report in reports])
+        resident = np.array([report['resident_rss_mb'] - report['start_rss_mb'] for report in reports])
+        slope = np.polyfit(sessions, resident, 1)[0]
+        print(f"\nresident RSS grows ~{slope:.1f} MB per additional concurrent session (warm caches)")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
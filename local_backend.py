@@ -0,0 +1,687 @@
+# Local DuckDB stand-in for the Snowpark session used by streamlit_app.py
+# Usage:
+#   python local_backend.py generate [--apps 3100] [--out fixtures]   # write synthetic fixture CSVs
+#   INVENTORY_BACKEND=local streamlit run streamlit_app.py
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import re
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from app_similarity import cluster_apps, minhash, shingle_hashes
+
+LOCAL_SCHEMA = 'INVENTORY.OCHOY'
+FIXTURE_DIR = os.environ.get('INVENTORY_FIXTURE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures'))
+STAGE_DIR = os.environ.get('INVENTORY_LOCAL_STAGE_DIR', os.path.join(FIXTURE_DIR, 'stages'))
+LOCAL_USER = os.environ.get('INVENTORY_LOCAL_USER', 'OCHOY')
+PS_ORG_LEADER = 'Roxanne McKinnon'
+
+FIXTURE_TABLES = {
+    'STREAMLIT_APPS_BASE': 'streamlit_apps_base.csv',
+    'STREAMLIT_USER_DIRECTORY': 'streamlit_user_directory.csv',
+    'RESOLVE_ORG': 'resolve_org.csv',
+    'STREAMLIT_APP_USAGE': 'streamlit_app_usage.csv',
+    'STREAMLIT_APP_HEALTH_DAILY': 'streamlit_app_health_daily.csv',
+    'STREAMLIT_APP_METADATA': 'streamlit_app_metadata.csv',
+    'STREAMLIT_APP_SOURCES': 'streamlit_app_sources.csv',
+    'STREAMLIT_SOURCE_SIGNATURES': 'streamlit_source_signatures.csv',
+    'STREAMLIT_APP_CLUSTERS': 'streamlit_app_clusters.csv',
+}
+SIMILARITY_TABLES = ['STREAMLIT_APP_SOURCES', 'STREAMLIT_SOURCE_SIGNATURES', 'STREAMLIT_APP_CLUSTERS']
+SOURCE_DIR = 'sources'
+
+# Explicit types, so a fixture with only a header row still loads with the columns the views expect
+FIXTURE_COLUMNS = {
+    'STREAMLIT_APPS_BASE': {
+        'NAME': 'VARCHAR', 'DATABASE_NAME': 'VARCHAR', 'SCHEMA_NAME': 'VARCHAR', 'LOCATION': 'VARCHAR',
+        'TITLE': 'VARCHAR', 'CREATED_ON': 'TIMESTAMP', 'OWNER_ROLE': 'VARCHAR', 'COMMENT': 'VARCHAR',
+        'QUERY_WAREHOUSE': 'VARCHAR', 'URL_ID': 'VARCHAR', 'LAST_UPDATED_USER_ID': 'VARCHAR',
+        'LAST_UPDATED_TIME': 'TIMESTAMP', 'CREATED_BY_USER': 'VARCHAR', 'REFRESHED_AT': 'TIMESTAMP',
+        'CREATOR_EMAIL': 'VARCHAR', 'CREATOR_DISPLAY_NAME': 'VARCHAR',
+    },
+    'STREAMLIT_USER_DIRECTORY': {
+        'NAME': 'VARCHAR', 'DISPLAY_NAME': 'VARCHAR', 'EMAIL_NORMALIZED': 'VARCHAR', 'SF_NAME': 'VARCHAR',
+        'REFRESHED_AT': 'TIMESTAMP',
+    },
+    'RESOLVE_ORG': {'RESOURCE_NAME': 'VARCHAR', 'MANAGER_NAME': 'VARCHAR', 'ORG_HIERARCHY': 'VARCHAR'},
+    'STREAMLIT_APP_USAGE': {'STREAMLIT_FQN': 'VARCHAR', 'EXECUTION_COUNT': 'BIGINT', 'UNIQUE_USERS': 'BIGINT'},
+    'STREAMLIT_APP_HEALTH_DAILY': {
+        'STREAMLIT_FQN': 'VARCHAR', 'USAGE_DATE': 'DATE', 'QUERY_COUNT': 'BIGINT', 'FAILED_COUNT': 'BIGINT',
+        'P50_ELAPSED_MS': 'DOUBLE', 'P95_ELAPSED_MS': 'DOUBLE', 'P99_ELAPSED_MS': 'DOUBLE',
+        'P50_QUEUED_MS': 'DOUBLE', 'P95_QUEUED_MS': 'DOUBLE', 'P99_QUEUED_MS': 'DOUBLE', 'LOADED_AT': 'TIMESTAMP',
+    },
+    'STREAMLIT_APP_METADATA': {
+        'LOCATION': 'VARCHAR', 'DESCRIPTION': 'VARCHAR', 'CATEGORY': 'VARCHAR', 'STATUS': 'VARCHAR',
+        'UPDATED_BY': 'VARCHAR', 'UPDATED_AT': 'TIMESTAMP',
+    },
+    'STREAMLIT_APP_SOURCES': {
+        'LOCATION': 'VARCHAR', 'CONTENT_HASH': 'VARCHAR', 'SOURCE_UPDATED_AT': 'TIMESTAMP', 'READ_ERROR': 'VARCHAR',
+        'READ_AT': 'TIMESTAMP',
+    },
+    'STREAMLIT_SOURCE_SIGNATURES': {
+        'CONTENT_HASH': 'VARCHAR', 'SHINGLE_COUNT': 'BIGINT', 'MINHASH': 'VARCHAR', 'COMPUTED_AT': 'TIMESTAMP',
+    },
+    'STREAMLIT_APP_CLUSTERS': {
+        'LOCATION': 'VARCHAR', 'CONTENT_HASH': 'VARCHAR', 'CLUSTER_ID': 'VARCHAR', 'CLUSTER_SIZE': 'BIGINT',
+        'SIMILARITY': 'DOUBLE', 'COMPUTED_AT': 'TIMESTAMP',
+    },
+}
+
+VIEWS = [
+    """
+    CREATE OR REPLACE VIEW {schema}.STREAMLIT_APPS_INVENTORY AS
+    SELECT * FROM {schema}.STREAMLIT_APPS_BASE
+    """,
+    """
+    CREATE OR REPLACE VIEW {schema}.STREAMLIT_APPS_WITH_ORG AS
+    WITH org_data AS (
+        SELECT RESOURCE_NAME, MANAGER_NAME, ORG_HIERARCHY
+        FROM {schema}.RESOLVE_ORG
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY LOWER(RESOURCE_NAME) ORDER BY RESOURCE_NAME) = 1
+    )
+    SELECT
+        i.*,
+        COALESCE(i.CREATOR_DISPLAY_NAME, d.SF_NAME) AS CREATOR_FULL_NAME,
+        o.MANAGER_NAME,
+        o.ORG_HIERARCHY
+    FROM {schema}.STREAMLIT_APPS_INVENTORY i
+    LEFT JOIN {schema}.STREAMLIT_USER_DIRECTORY d ON d.NAME = i.CREATED_BY_USER
+    LEFT JOIN org_data o ON LOWER(o.RESOURCE_NAME) = LOWER(COALESCE(i.CREATOR_DISPLAY_NAME, d.SF_NAME))
+    """,
+    """
+    CREATE OR REPLACE VIEW {schema}.STREAMLIT_APPS_PS_ONLY AS
+    SELECT a.*
+    FROM {schema}.STREAMLIT_APPS_WITH_ORG a
+    WHERE a.ORG_HIERARCHY LIKE '%{ps_org_leader}%'
+    """,
+    """
+    CREATE OR REPLACE VIEW {schema}.STREAMLIT_APP_USAGE_PS_ONLY AS
+    SELECT u.*
+    FROM {schema}.STREAMLIT_APP_USAGE u
+    JOIN {schema}.STREAMLIT_APPS_PS_ONLY a ON u.STREAMLIT_FQN = a.LOCATION
+    """,
+    # DuckDB has no mergeable percentile states, so the rollup weights each day's percentile by its query count
+    """
+    CREATE OR REPLACE VIEW {schema}.STREAMLIT_APP_HEALTH AS
+    SELECT
+        STREAMLIT_FQN,
+        SUM(QUERY_COUNT) AS QUERY_COUNT,
+        SUM(FAILED_COUNT) AS FAILED_COUNT,
+        100 * SUM(FAILED_COUNT) / NULLIF(SUM(QUERY_COUNT), 0) AS ERROR_RATE_PCT,
+        SUM(P50_ELAPSED_MS * QUERY_COUNT) / NULLIF(SUM(QUERY_COUNT), 0) AS P50_ELAPSED_MS,
+        SUM(P95_ELAPSED_MS * QUERY_COUNT) / NULLIF(SUM(QUERY_COUNT), 0) AS P95_ELAPSED_MS,
+        SUM(P99_ELAPSED_MS * QUERY_COUNT) / NULLIF(SUM(QUERY_COUNT), 0) AS P99_ELAPSED_MS,
+        SUM(P50_QUEUED_MS * QUERY_COUNT) / NULLIF(SUM(QUERY_COUNT), 0) AS P50_QUEUED_MS,
+        SUM(P95_QUEUED_MS * QUERY_COUNT) / NULLIF(SUM(QUERY_COUNT), 0) AS P95_QUEUED_MS,
+        SUM(P99_QUEUED_MS * QUERY_COUNT) / NULLIF(SUM(QUERY_COUNT), 0) AS P99_QUEUED_MS,
+        MAX(LOADED_AT) AS LOADED_AT
+    FROM {schema}.STREAMLIT_APP_HEALTH_DAILY
+    WHERE USAGE_DATE > (SELECT MAX(USAGE_DATE) FROM {schema}.STREAMLIT_APP_HEALTH_DAILY) - INTERVAL 90 DAY
+    GROUP BY 1
+    """,
+    """
+    CREATE OR REPLACE VIEW {schema}.STREAMLIT_APP_HEALTH_PS_ONLY AS
+    SELECT h.*
+    FROM {schema}.STREAMLIT_APP_HEALTH h
+    JOIN {schema}.STREAMLIT_APPS_PS_ONLY a ON h.STREAMLIT_FQN = a.LOCATION
+    """,
+]
+
+MATERIALIZED_VIEWS = {
+    'STREAMLIT_APPS_WITH_ORG_MAT': 'STREAMLIT_APPS_WITH_ORG',
+    'STREAMLIT_APPS_PS_ONLY_MAT': 'STREAMLIT_APPS_PS_ONLY',
+}
+
+EMBEDDING_DIMENSIONS = 768
+EMBEDDINGS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {schema}.STREAMLIT_APP_EMBEDDINGS (
+        LOCATION VARCHAR,
+        TEXT_HASH VARCHAR,
+        METADATA_UPDATED_AT TIMESTAMP,
+        EMBEDDING FLOAT[768],
+        EMBEDDED_AT TIMESTAMP
+    )
+"""
+REFRESH_EMBEDDINGS = """
+    MERGE INTO {schema}.STREAMLIT_APP_EMBEDDINGS t
+    USING (
+        WITH docs AS (
+            SELECT 
+                b.LOCATION,
+                COALESCE(NULLIF(TRIM(b.TITLE), ''), b.NAME) || COALESCE('. ' || m.DESCRIPTION, '') AS doc_text,
+                m.UPDATED_AT
+            FROM {schema}.STREAMLIT_APPS_BASE b
+            LEFT JOIN {schema}.STREAMLIT_APP_METADATA m ON m.LOCATION = b.LOCATION
+        )
+        SELECT d.LOCATION, d.doc_text, sha256(d.doc_text) AS text_hash, d.UPDATED_AT
+        FROM docs d
+        LEFT JOIN {schema}.STREAMLIT_APP_EMBEDDINGS e ON e.LOCATION = d.LOCATION
+        WHERE e.LOCATION IS NULL OR e.TEXT_HASH <> sha256(d.doc_text)
+    ) s
+    ON t.LOCATION = s.LOCATION
+    WHEN MATCHED THEN UPDATE SET
+        TEXT_HASH = s.text_hash,
+        METADATA_UPDATED_AT = s.UPDATED_AT,
+        EMBEDDING = EMBED_TEXT_768('local', s.doc_text),
+        EMBEDDED_AT = {embedded_at}
+    WHEN NOT MATCHED THEN INSERT (LOCATION, TEXT_HASH, METADATA_UPDATED_AT, EMBEDDING, EMBEDDED_AT)
+        VALUES (s.LOCATION, s.text_hash, s.UPDATED_AT, EMBED_TEXT_768('local', s.doc_text), {embedded_at})
+"""
+
+
+def embed_text(model, text):
+    # Stand-in for Cortex EMBED_TEXT_768: signed feature hashing of words and word pairs, L2-normalized
+    vector = np.zeros(EMBEDDING_DIMENSIONS, dtype=np.float32)
+    words = re.findall(r'[a-z0-9]+', (text or '').lower())
+    for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        vector[int.from_bytes(digest[:4], 'little') % EMBEDDING_DIMENSIONS] += 1.0 if digest[4] & 1 else -1.0
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).tolist()
+
+
+class LocalRow(tuple):
+    def __new__(cls, values, fields):
+        row = super().__new__(cls, values)
+        row._fields = fields
+        return row
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._fields.index(key))
+        return tuple.__getitem__(self, key)
+
+    def as_dict(self):
+        return dict(zip(self._fields, self))
+
+
+class LocalDataFrame:
+    def __init__(self, session, query, params=None):
+        self._session = session
+        self._query = query
+        self._params = params
+
+    def collect(self, statement_params=None):
+        cursor = self._session._execute(self._query, statement_params, self._params)
+        fields = [column[0] for column in cursor.description] if cursor.description else []
+        return [LocalRow(values, fields) for values in cursor.fetchall()]
+
+    def to_pandas(self, statement_params=None):
+        df = self._session._execute(self._query, statement_params, self._params).df()
+        for column in df.columns:
+            if not pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_datetime64_any_dtype(df[column]):
+                df[column] = df[column].astype(object).where(df[column].notna(), None)
+        return df
+
+
+class LocalFileOperation:
+    def __init__(self, session, root):
+        self._session = session
+        self._root = root
+
+    def _stage_path(self, stage_location):
+        stage, _, path = stage_location.lstrip('@').partition('/')
+        return os.path.join(self._root, stage.upper(), path)
+
+    def put(self, local_file_name, stage_location, auto_compress=True, overwrite=False, statement_params=None):
+        self._session._log(f"PUT file://{local_file_name} {stage_location}", 0.0, statement_params)
+        target_dir = self._stage_path(stage_location)
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, os.path.basename(local_file_name))
+        if overwrite or not os.path.exists(target):
+            shutil.copyfile(local_file_name, target)
+        return [os.path.basename(local_file_name)]
+
+    def get(self, stage_location, target_directory, statement_params=None):
+        self._session._log(f"GET {stage_location} file://{target_directory}", 0.0, statement_params)
+        source = self._stage_path(stage_location)
+        if os.path.isdir(source):
+            files = [os.path.join(source, name) for name in os.listdir(source) if os.path.isfile(os.path.join(source, name))]
+        elif os.path.isfile(source):
+            files = [source]
+        else:
+            files = []
+        os.makedirs(target_directory, exist_ok=True)
+        for path in files:
+            shutil.copyfile(path, os.path.join(target_directory, os.path.basename(path)))
+        return [os.path.basename(path) for path in files]
+
+
+class LocalDatabase:
+    def __init__(self, fixture_dir, schema=LOCAL_SCHEMA):
+        self.schema = schema
+        self.fixture_dir = fixture_dir
+        self.query_log = []
+        self.log_lock = threading.Lock()
+        self.connection = duckdb.connect()
+        self.connection.create_function('EMBED_TEXT_768', embed_text, ['VARCHAR', 'VARCHAR'], f'FLOAT[{EMBEDDING_DIMENSIONS}]')
+        database, schema_name = schema.split('.')
+        self.connection.execute(f"ATTACH ':memory:' AS {database}")
+        self.connection.execute(f"CREATE SCHEMA {database}.{schema_name}")
+        if not all(os.path.exists(os.path.join(fixture_dir, file_name)) for file_name in [*FIXTURE_TABLES.values(), SOURCE_DIR]):
+            generate_fixtures(fixture_dir)
+        for table, file_name in FIXTURE_TABLES.items():
+            path = os.path.join(fixture_dir, file_name).replace("'", "''")
+            columns = ', '.join(f"'{column}': '{column_type}'" for column, column_type in FIXTURE_COLUMNS[table].items())
+            self.connection.execute(f"CREATE TABLE {schema}.{table} AS SELECT * FROM read_csv('{path}', header = true, columns = {{{columns}}})")
+        for view in VIEWS:
+            self.connection.execute(view.format(schema=schema, ps_org_leader=PS_ORG_LEADER))
+        self.materialize()
+        self.connection.execute(EMBEDDINGS_TABLE.format(schema=schema))
+        # Stamp the initial backfill with the fixture refresh time, so the inventory version (and warm-start snapshots) survive restarts
+        self.refresh_embeddings(embedded_at=f"(SELECT MAX(REFRESHED_AT) FROM {schema}.STREAMLIT_APPS_BASE)")
+
+    def materialize(self):
+        for table, view in MATERIALIZED_VIEWS.items():
+            self.connection.execute(f"CREATE OR REPLACE TABLE {self.schema}.{table} AS SELECT * FROM {self.schema}.{view}")
+
+    def refresh_embeddings(self, embedded_at='CURRENT_TIMESTAMP'):
+        self.connection.execute(f"DELETE FROM {self.schema}.STREAMLIT_APP_EMBEDDINGS WHERE LOCATION NOT IN (SELECT LOCATION FROM {self.schema}.STREAMLIT_APPS_BASE)")
+        return self.connection.execute(REFRESH_EMBEDDINGS.format(schema=self.schema, embedded_at=embedded_at)).fetchone()[0]
+
+
+class LocalSession:
+    def __init__(self, database, user=LOCAL_USER, session_id=None):
+        self._database = database
+        self.user = user
+        self.session_id = session_id
+        self.query_tag = None
+        self.file = LocalFileOperation(self, STAGE_DIR)
+
+    def _log(self, query, elapsed_ms, statement_params=None):
+        with self._database.log_lock:
+            self._database.query_log.append({
+                'session_id': self.session_id,
+                'query': query,
+                'query_tag': (statement_params or {}).get('QUERY_TAG', self.query_tag),
+                'elapsed_ms': elapsed_ms,
+                'start_time': time.time(),
+            })
+
+    def _translate(self, query):
+        if re.match(r"\s*SHOW\s+PARAMETERS\s+LIKE\s+'QUERY_TAG'", query, re.IGNORECASE):
+            return """SELECT 'QUERY_TAG' AS "key", '' AS "value\""""
+        query = re.sub(r"CURRENT_USER\(\)", "'" + self.user.replace("'", "''") + "'", query, flags=re.IGNORECASE)
+        query = re.sub(r"SNOWFLAKE\.CORTEX\.EMBED_TEXT_768\(", "EMBED_TEXT_768(", query, flags=re.IGNORECASE)
+        return re.sub(r"CURRENT_TIMESTAMP\(\)", "CURRENT_TIMESTAMP", query, flags=re.IGNORECASE)
+
+    def _execute(self, query, statement_params=None, params=None):
+        start = time.perf_counter()
+        cursor = self._database.connection.cursor()
+        cursor.execute(self._translate(query), params)
+        self._log(query, (time.perf_counter() - start) * 1000, statement_params)
+        return cursor
+
+    def sql(self, query, params=None):
+        return LocalDataFrame(self, query, params)
+
+    def call(self, procedure, *args, statement_params=None):
+        name = procedure.split('.')[-1].upper()
+        if name not in LOCAL_PROCEDURES:
+            raise ValueError(f"Procedure not available on the local backend: {procedure}")
+        start = time.perf_counter()
+        result = LOCAL_PROCEDURES[name](self, *args)
+        self._log(f"CALL {procedure}({', '.join(repr(arg) for arg in args)})", (time.perf_counter() - start) * 1000, statement_params)
+        return result
+
+
+def refresh_streamlit_apps(session):
+    session._database.materialize()
+    count = session.sql(f"SELECT COUNT(*) FROM {session._database.schema}.STREAMLIT_APPS_BASE").collect()[0][0]
+    return f"Refreshed {count} apps"
+
+
+def read_main_file(database, app_location):
+    path = os.path.join(database.fixture_dir, SOURCE_DIR, f"{app_location}.py")
+    if not os.path.exists(path):
+        return None, "No source stage found for this app"
+    with open(path) as f:
+        code_content = f.read()
+    if not code_content.strip():
+        return None, f"Could not read file content from {path}"
+    return code_content, None
+
+
+def refresh_app_similarity(session, max_apps=500):
+    # Same steps as the Snowflake procedure, with fixture source files standing in for the app stages
+    database, schema = session._database, session._database.schema
+    caller_tag = session.query_tag
+    try:
+        session.query_tag = json.dumps({'app': 'STREAMLIT_APP_INVENTORY', 'component': 'REFRESH_APP_SIMILARITY', 'phase': 'pending'})
+        pending = session.sql(f"""
+            SELECT b.LOCATION, COALESCE(b.LAST_UPDATED_TIME, b.CREATED_ON) AS SOURCE_UPDATED_AT
+            FROM {schema}.STREAMLIT_APPS_BASE b
+            LEFT JOIN {schema}.STREAMLIT_APP_SOURCES s ON s.LOCATION = b.LOCATION
+            WHERE s.LOCATION IS NULL OR COALESCE(b.LAST_UPDATED_TIME, b.CREATED_ON) > s.SOURCE_UPDATED_AT
+            ORDER BY SOURCE_UPDATED_AT DESC
+            {'' if max_apps is None else f'LIMIT {int(max_apps)}'}
+        """).collect()
+        known = {row['CONTENT_HASH'] for row in session.sql(f"SELECT CONTENT_HASH FROM {schema}.STREAMLIT_SOURCE_SIGNATURES").collect()}
+
+        sources, signatures = [], []
+        for row in pending:
+            code_content, error = read_main_file(database, row['LOCATION'])
+            content_hash = hashlib.sha256(code_content.encode()).hexdigest() if code_content else None
+            if content_hash and content_hash not in known:
+                hashes = shingle_hashes(code_content)
+                if len(hashes):
+                    signatures.append((content_hash, len(hashes), json.dumps(minhash(hashes).tolist())))
+                    known.add(content_hash)
+            sources.append((row['LOCATION'], content_hash, row['SOURCE_UPDATED_AT'], error))
+
+        cursor = database.connection.cursor()
+        if sources:
+            cursor.register('sources_staging', pd.DataFrame(sources, columns=['LOCATION', 'CONTENT_HASH', 'SOURCE_UPDATED_AT', 'READ_ERROR']))
+            cursor.execute(f"""
+                MERGE INTO {schema}.STREAMLIT_APP_SOURCES t
+                USING sources_staging s
+                ON t.LOCATION = s.LOCATION
+                WHEN MATCHED THEN UPDATE SET
+                    CONTENT_HASH = s.CONTENT_HASH,
+                    SOURCE_UPDATED_AT = s.SOURCE_UPDATED_AT,
+                    READ_ERROR = s.READ_ERROR,
+                    READ_AT = CURRENT_TIMESTAMP
+                WHEN NOT MATCHED THEN INSERT (LOCATION, CONTENT_HASH, SOURCE_UPDATED_AT, READ_ERROR, READ_AT)
+                    VALUES (s.LOCATION, s.CONTENT_HASH, s.SOURCE_UPDATED_AT, s.READ_ERROR, CURRENT_TIMESTAMP)
+            """)
+        if signatures:
+            cursor.register('signatures_staging', pd.DataFrame(signatures, columns=['CONTENT_HASH', 'SHINGLE_COUNT', 'MINHASH']))
+            cursor.execute(f"""
+                INSERT INTO {schema}.STREAMLIT_SOURCE_SIGNATURES (CONTENT_HASH, SHINGLE_COUNT, MINHASH, COMPUTED_AT)
+                SELECT CONTENT_HASH, SHINGLE_COUNT, MINHASH, CURRENT_TIMESTAMP FROM signatures_staging
+            """)
+
+        session.query_tag = json.dumps({'app': 'STREAMLIT_APP_INVENTORY', 'component': 'REFRESH_APP_SIMILARITY', 'phase': 'cluster'})
+        apps = session.sql(f"""
+            SELECT s.LOCATION, s.CONTENT_HASH, g.MINHASH, b.CREATED_ON
+            FROM {schema}.STREAMLIT_APP_SOURCES s
+            JOIN {schema}.STREAMLIT_SOURCE_SIGNATURES g ON g.CONTENT_HASH = s.CONTENT_HASH
+            JOIN {schema}.STREAMLIT_APPS_BASE b ON b.LOCATION = s.LOCATION
+            ORDER BY b.CREATED_ON, s.LOCATION
+        """).to_pandas()
+        if apps.empty:
+            return f"Read {len(sources)} apps; no signatures to cluster"
+        apps = cluster_apps(apps)
+
+        cursor.register('clusters_staging', apps[['LOCATION', 'CONTENT_HASH', 'CLUSTER_ID', 'CLUSTER_SIZE', 'SIMILARITY']])
+        cursor.execute("BEGIN TRANSACTION")
+        cursor.execute(f"DELETE FROM {schema}.STREAMLIT_APP_CLUSTERS")
+        cursor.execute(f"""
+            INSERT INTO {schema}.STREAMLIT_APP_CLUSTERS (LOCATION, CONTENT_HASH, CLUSTER_ID, CLUSTER_SIZE, SIMILARITY, COMPUTED_AT)
+            SELECT LOCATION, CONTENT_HASH, CLUSTER_ID, CLUSTER_SIZE, SIMILARITY, CURRENT_TIMESTAMP FROM clusters_staging
+        """)
+        cursor.execute("COMMIT")
+    finally:
+        session.query_tag = caller_tag
+
+    duplicated = int((apps['CLUSTER_SIZE'] > 1).sum())
+    return f"Read {len(sources)} apps, {len(signatures)} new signatures; {duplicated} of {len(apps)} apps are in {apps.loc[apps['CLUSTER_SIZE'] > 1, 'ROOT'].nunique()} near-duplicate clusters"
+
+
+def refresh_app_embeddings(session):
+    return f"Embedded {session._database.refresh_embeddings()} new or changed apps"
+
+
+def generate_app_description(session, app_location):
+    if len(app_location.split('.')) != 3:
+        return f"Error: Invalid location format: {app_location}"
+    return f"Local placeholder description for {app_location.split('.')[-1]} (Cortex is not available on the local backend)."
+
+
+LOCAL_PROCEDURES = {
+    'REFRESH_STREAMLIT_APPS': refresh_streamlit_apps,
+    'REFRESH_APP_SIMILARITY': refresh_app_similarity,
+    'REFRESH_APP_EMBEDDINGS': refresh_app_embeddings,
+    'GENERATE_APP_DESCRIPTION': generate_app_description,
+}
+
+_database = None
+_sessions = {}
+_lock = threading.Lock()
+
+
+def get_local_database():
+    global _database
+    with _lock:
+        if _database is None:
+            _database = LocalDatabase(FIXTURE_DIR)
+        return _database
+
+
+def get_local_session():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx else None
+    database = get_local_database()
+    with _lock:
+        if session_id not in _sessions:
+            _sessions[session_id] = LocalSession(database, session_id=session_id)
+        return _sessions[session_id]
+
+
+FIRST_NAMES = ["Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn", "Parker",
+               "Drew", "Reese", "Rowan", "Sage", "Skyler", "Emerson", "Finley", "Harper", "Kendall", "Logan",
+               "Marley", "Noel", "Oakley", "Peyton", "Remy", "Shawn", "Tatum", "Val", "Wren", "Zion"]
+LAST_NAMES = ["Garcia", "Chen", "Patel", "Nguyen", "Smith", "Kim", "Lopez", "Singh", "Brown", "Murphy",
+              "Okafor", "Rossi", "Schmidt", "Tanaka", "Haddad", "Novak", "Silva", "Costa", "Ivanova", "Larsen",
+              "Moreau", "Byrne", "Dubois", "Kowalski", "Yamamoto", "Fischer", "Reyes", "Ahmed", "Cohen", "Walsh"]
+TITLE_WORDS = ["Customer", "Usage", "Cost", "Migration", "Health", "Pipeline", "Revenue", "Account", "Warehouse",
+               "Query", "Forecast", "Security", "Adoption", "Consumption", "Workload", "Governance", "Data Quality"]
+TITLE_SUFFIXES = ["Dashboard", "Explorer", "Tracker", "Assessment", "Analyzer", "Monitor", "Report", "Calculator", "Demo"]
+DESCRIPTION_TEMPLATES = [
+    "Tracks {a} and {b} trends across customer accounts with drill-down by region.",
+    "Interactive {a} explorer that highlights {b} outliers and exports summaries.",
+    "Assesses {a} readiness and recommends next steps for {b} improvements.",
+    "Monitors {a} in near real time and alerts on {b} regressions.",
+]
+DATABASES = ["SNOWPUBLIC", "SALES", "PS_TOOLS", "SE_SANDBOX", "FINANCE", "TEMP", "MARKETING", "SUPPORT", "SNOWFLAKE360", "DEMO_DB"]
+SCHEMAS = ["STREAMLIT", "PUBLIC", "APPS", "DEV", "REPORTING", "ANALYTICS"]
+OWNER_ROLES = ["TECHNICAL_ACCOUNT_MANAGER", "SALES_ENGINEER", "PS_CONSULTANT", "SYSADMIN", "DATA_ENGINEER", "PUBLIC"]
+SOURCE_COLUMNS = ["ACCOUNT_NAME", "REGION", "CREDITS_USED", "QUERY_COUNT", "WAREHOUSE_NAME", "USAGE_DATE", "REVENUE",
+                  "STATUS", "OWNER", "SEGMENT", "BYTES_SCANNED", "ERROR_COUNT", "FORECAST", "TICKET_COUNT"]
+SOURCE_WIDGETS = ["st.selectbox", "st.multiselect", "st.radio", "st.select_slider", "st.pills"]
+SOURCE_OUTPUTS = ["st.bar_chart", "st.line_chart", "st.area_chart", "st.scatter_chart", "st.dataframe"]
+CATEGORIES = ["Analytics", "Operations", "Customer-facing", "Internal Tool", "Demo", "Other"]
+STATUSES = ["Active", "In Development", "Deprecated", "Archived"]
+
+
+TEMPLATE_TITLE = re.compile(r"^[A-Z0-9]+ \d{4}-\d{2}-\d{2} \d{2}:\d{2}(am|pm)$")
+
+
+def write_csv(path, columns, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(['' if value is None else value for value in row])
+
+
+def generate_people(rng, count):
+    people = []
+    seen = set()
+    while len(people) < count:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        username = (first[0] + last).upper()
+        suffix = 1
+        while username in seen:
+            suffix += 1
+            username = f"{(first[0] + last).upper()}{suffix}"
+        seen.add(username)
+        display_name = f"{first} {last}" if suffix == 1 else f"{first} {last} {suffix}"
+        people.append({'name': username, 'display_name': display_name, 'email': f"{username.lower()}@example.com"})
+    return people
+
+
+def generate_source_line(rng, i, frames):
+    column, other = rng.sample(SOURCE_COLUMNS, 2)
+    kind = 0 if not frames or rng.random() < 0.2 else rng.randrange(1, 5)
+    if kind == 0:
+        table = f"{rng.choice(DATABASES)}.{rng.choice(SCHEMAS)}.{rng.choice(TITLE_WORDS).upper().replace(' ', '_')}"
+        frames.append(f"df_{i}")
+        return f'df_{i} = session.sql("SELECT {column}, {other} FROM {table} WHERE {column} IS NOT NULL LIMIT {rng.randint(10, 5000)}").to_pandas()'
+    frame = rng.choice(frames)
+    if kind == 1:
+        return f'{column.lower()}_{i} = {rng.choice(SOURCE_WIDGETS)}("{rng.choice(TITLE_WORDS)} {column.title()}", sorted({frame}["{column}"].unique()), key="{column.lower()}_{i}")'
+    if kind == 2:
+        return f'{rng.choice(SOURCE_OUTPUTS)}({frame}, x="{column}", y="{other}", height={rng.randint(200, 600)})'
+    if kind == 3:
+        return f'st.metric("{rng.choice(TITLE_WORDS)} {column.title()}", f"{{{frame}[\'{column}\'].sum():,.0f}}", delta={rng.randint(-50, 50)})'
+    return f'{frame} = {frame}[{frame}["{column}"] > {rng.randint(0, 1000)}].sort_values("{other}", ascending={rng.choice([True, False])})'
+
+
+def generate_source(rng, title):
+    frames = []
+    lines = ["import streamlit as st", "import pandas as pd", "from snowflake.snowpark.context import get_active_session", "",
+             "session = get_active_session()", f'st.title("{title}")', ""]
+    return '\n'.join(lines + [generate_source_line(rng, i, frames) for i in range(rng.randint(40, 120))]) + '\n'
+
+
+def mutate_source(rng, code, rate):
+    lines = code.split('\n')
+    frames = re.findall(r'^(df_\d+) =', code, re.MULTILINE)
+    return '\n'.join(generate_source_line(rng, i, frames) if i > 6 and line and rng.random() < rate else line for i, line in enumerate(lines))
+
+
+def generate_sources(rng, base_rows, sources_dir, seed, templates=12, small_clusters=40):
+    # Most template-titled apps are copies of a few templates, some others are copied around; the rest are unique
+    os.makedirs(sources_dir, exist_ok=True)
+    originals = {}
+    for name, database, schema, location, title, *_ in base_rows:
+        if rng.random() < 0.15:
+            continue
+        if title and TEMPLATE_TITLE.match(title) and rng.random() < 0.9:
+            family = f"template-{rng.randrange(templates)}"
+        elif rng.random() < 0.05:
+            family = f"copy-{rng.randrange(small_clusters)}"
+        else:
+            family = None
+        if family is None:
+            code = generate_source(rng, title or name)
+        else:
+            if family not in originals:
+                family_rng = random.Random(f"{seed}-{family}")
+                originals[family] = generate_source(family_rng, f"{family_rng.choice(TITLE_WORDS)} {family_rng.choice(TITLE_SUFFIXES)}")
+            code = originals[family] if rng.random() < 0.4 else mutate_source(rng, originals[family], rng.uniform(0.01, 0.1))
+        with open(os.path.join(sources_dir, f"{location}.py"), 'w') as f:
+            f.write(code)
+
+
+def generate_fixtures(out_dir, apps=3100, users=900, seed=7):
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    os.makedirs(out_dir, exist_ok=True)
+
+    people = generate_people(rng, users)
+    ceo, vps = people[0], people[1:7]
+    vps[0]['display_name'] = PS_ORG_LEADER
+    directors, managers = people[7:37], people[37:137]
+    managers[0].update(name=LOCAL_USER, email=f"{LOCAL_USER.lower()}@example.com")
+    org = {ceo['display_name']: (None, ceo['display_name'])}
+    for vp in vps:
+        org[vp['display_name']] = (ceo['display_name'], f"{ceo['display_name']} => {vp['display_name']}")
+    for i, director in enumerate(directors):
+        vp = vps[i % len(vps)]['display_name']
+        org[director['display_name']] = (vp, f"{org[vp][1]} => {director['display_name']}")
+    for i, manager in enumerate(managers):
+        director = directors[i % len(directors)]['display_name']
+        org[manager['display_name']] = (director, f"{org[director][1]} => {manager['display_name']}")
+    for person in people[137:]:
+        if rng.random() < 0.85:
+            manager = rng.choice(managers)['display_name']
+            org[person['display_name']] = (manager, f"{org[manager][1]} => {person['display_name']}")
+
+    write_csv(os.path.join(out_dir, FIXTURE_TABLES['STREAMLIT_USER_DIRECTORY']), list(FIXTURE_COLUMNS['STREAMLIT_USER_DIRECTORY']),
+              [(p['name'], p['display_name'] if p['name'] == LOCAL_USER or rng.random() < 0.8 else None, p['email'], p['display_name'], now) for p in people])
+    write_csv(os.path.join(out_dir, FIXTURE_TABLES['RESOLVE_ORG']), list(FIXTURE_COLUMNS['RESOLVE_ORG']),
+              [(name, manager, hierarchy) for name, (manager, hierarchy) in org.items()])
+
+    base_rows, metadata_rows, usage_rows, health_rows = [], [], [], []
+    for i in range(apps):
+        creator = rng.choice(people[137:] + managers) if rng.random() < 0.49 else None
+        created_on = now - timedelta(days=rng.randint(0, 1100), minutes=rng.randint(0, 1440))
+        if creator and rng.random() < 0.5:
+            title = f"{creator['name']} {created_on:%Y-%m-%d} {created_on:%I:%M%p}".replace('AM', 'am').replace('PM', 'pm')
+        elif rng.random() < 0.1:
+            title = None
+        else:
+            title = f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_SUFFIXES)}"
+        name = f"{rng.choice(TITLE_WORDS).upper().replace(' ', '_')}_{i:05d}"
+        database, schema = rng.choice(DATABASES), rng.choice(SCHEMAS)
+        location = f"{database}.{schema}.{name}"
+        last_updated = created_on + timedelta(days=rng.randint(0, 200)) if rng.random() < 0.65 else None
+        last_updated = min(last_updated, now) if last_updated else None
+        comment = json.dumps({'lastUpdatedUser': str(rng.randint(10**6, 10**7)), 'lastUpdatedTime': int(last_updated.timestamp() * 1000)}) if last_updated else None
+        base_rows.append((
+            name, database, schema, location, title, created_on, rng.choice(OWNER_ROLES), comment, 'SNOWHOUSE',
+            f"{rng.getrandbits(64):016x}", comment and json.loads(comment)['lastUpdatedUser'], last_updated,
+            creator['name'] if creator else None, now, creator['email'] if creator else None,
+            creator['display_name'] if creator else None,
+        ))
+
+        if rng.random() < 0.3:
+            words = rng.sample(TITLE_WORDS, 2)
+            metadata_rows.append((
+                location, rng.choice(DESCRIPTION_TEMPLATES).format(a=words[0].lower(), b=words[1].lower()),
+                rng.choice(CATEGORIES), rng.choice(STATUSES), creator['name'] if creator else LOCAL_USER,
+                now - timedelta(days=rng.randint(0, 60)),
+            ))
+
+        if rng.random() < 0.6:
+            executions = int(rng.paretovariate(1.1) * 3)
+            usage_rows.append((location, executions, max(1, min(executions, int(rng.paretovariate(1.5))))))
+            p50 = rng.lognormvariate(6, 0.8)
+            error_rate = rng.betavariate(1, 40)
+            for day in rng.sample(range(90), k=min(90, 1 + executions // 5)):
+                queries = rng.randint(1, 40) * max(1, executions // 50)
+                health_rows.append((
+                    location, (now - timedelta(days=day)).date(), queries, sum(rng.random() < error_rate for _ in range(queries)),
+                    round(p50, 1), round(p50 * rng.uniform(2, 6), 1), round(p50 * rng.uniform(6, 15), 1),
+                    0.0, round(rng.expovariate(1 / 50), 1), round(rng.expovariate(1 / 400), 1), now,
+                ))
+
+    write_csv(os.path.join(out_dir, FIXTURE_TABLES['STREAMLIT_APPS_BASE']), list(FIXTURE_COLUMNS['STREAMLIT_APPS_BASE']),
+              base_rows)
+    write_csv(os.path.join(out_dir, FIXTURE_TABLES['STREAMLIT_APP_METADATA']), list(FIXTURE_COLUMNS['STREAMLIT_APP_METADATA']),
+              metadata_rows)
+    write_csv(os.path.join(out_dir, FIXTURE_TABLES['STREAMLIT_APP_USAGE']), list(FIXTURE_COLUMNS['STREAMLIT_APP_USAGE']),
+              usage_rows)
+    write_csv(os.path.join(out_dir, FIXTURE_TABLES['STREAMLIT_APP_HEALTH_DAILY']), list(FIXTURE_COLUMNS['STREAMLIT_APP_HEALTH_DAILY']),
+              health_rows)
+    generate_sources(random.Random(seed + 1), base_rows, os.path.join(out_dir, SOURCE_DIR), seed)
+
+    # Sign and cluster the sources with the same code path as REFRESH_APP_SIMILARITY, then save the results
+    for table in SIMILARITY_TABLES:
+        write_csv(os.path.join(out_dir, FIXTURE_TABLES[table]), list(FIXTURE_COLUMNS[table]), [])
+    database = LocalDatabase(out_dir)
+    start = time.perf_counter()
+    result = refresh_app_similarity(LocalSession(database), max_apps=None)
+    elapsed = time.perf_counter() - start
+    for table in SIMILARITY_TABLES:
+        path = os.path.join(out_dir, FIXTURE_TABLES[table]).replace("'", "''")
+        database.connection.execute(f"COPY {database.schema}.{table} TO '{path}' (HEADER)")
+    return f"{result} ({elapsed:.1f}s)"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local DuckDB backend for the Streamlit App Inventory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    generate = subparsers.add_parser('generate', help="Write synthetic fixture CSVs")
+    generate.add_argument('--apps', type=int, default=3100)
+    generate.add_argument('--users', type=int, default=900)
+    generate.add_argument('--seed', type=int, default=7)
+    generate.add_argument('--out', default=FIXTURE_DIR)
+    args = parser.parse_args()
+    similarity = generate_fixtures(args.out, apps=args.apps, users=args.users, seed=args.seed)
+    print(f"Wrote fixtures for {args.apps:,} apps to {args.out}")
+    print(f"REFRESH_APP_SIMILARITY: {similarity}")
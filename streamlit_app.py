@@ -1,44 +1,278 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
 import streamlit as st
 import pandas as pd
-from snowflake.snowpark.context import get_active_session
+import numpy as np
 
 st.set_page_config(layout="wide", page_title="Streamlit App Inventory")
 
-session = get_active_session()
-current_user = session.sql("SELECT CURRENT_USER()").collect()[0][0]
+if os.environ.get('INVENTORY_BACKEND', 'snowflake') == 'local':
+    from local_backend import LOCAL_SCHEMA, get_local_session
+    session = get_local_session()
+    INVENTORY_SCHEMA = os.environ.get('INVENTORY_SCHEMA', LOCAL_SCHEMA)
+else:
+    from snowflake.snowpark.context import get_active_session
+    session = get_active_session()
+    INVENTORY_SCHEMA = os.environ.get('INVENTORY_SCHEMA', 'TEMP.OCHOY')
+
+QUERY_TAG_APP = "STREAMLIT_APP_INVENTORY"
+
+if 'session_context' not in st.session_state:
+    # The per-viewer base tag is built from these two queries, so they carry the app name only
+    startup_tag = {'QUERY_TAG': json.dumps({'app': QUERY_TAG_APP, 'component': 'session', 'phase': 'startup'})}
+    caller_tag = session.sql("SHOW PARAMETERS LIKE 'QUERY_TAG' IN SESSION").collect(statement_params=startup_tag)
+    try:
+        caller_tag = json.loads(caller_tag[0]['value']) if caller_tag and caller_tag[0]['value'] else {}
+    except ValueError:
+        caller_tag = {}
+    st.session_state['session_context'] = {
+        'user': session.sql("SELECT CURRENT_USER()").collect(statement_params=startup_tag)[0][0],
+        'query_tag': caller_tag if isinstance(caller_tag, dict) else {},
+    }
+
+current_user = st.session_state['session_context']['user']
+QUERY_TAG_BASE = {**st.session_state['session_context']['query_tag'], 'app': QUERY_TAG_APP, 'user': current_user}
+
+def query_tag(component, phase, cache_key=None):
+    return {'QUERY_TAG': json.dumps({**QUERY_TAG_BASE, 'component': component, 'phase': phase, 'cache_key': cache_key})}
 
 CATEGORIES = ["", "Analytics", "Operations", "Customer-facing", "Internal Tool", "Demo", "Other"]
 STATUSES = ["", "Active", "In Development", "Deprecated", "Archived"]
+SORT_COLUMNS = {
+    "Last Updated": 'LAST_UPDATED_TIME',
+    "Title": 'TITLE',
+    "Creator": 'CREATED_BY_USER',
+    "Creator Name": 'CREATOR_FULL_NAME',
+    "Manager": 'MANAGER_NAME',
+    "Status": 'STATUS',
+    "Error %": 'ERROR_RATE_PCT',
+    "P95 Latency": 'P95_ELAPSED_MS',
+    "Copies": 'CLUSTER_SIZE',
+}
+HEALTH_COLUMNS = ['ERROR_RATE_PCT', 'P50_ELAPSED_MS', 'P95_ELAPSED_MS', 'P99_ELAPSED_MS', 'P95_QUEUED_MS', 'HEALTH_LOADED_AT']
+CLUSTER_COLUMNS = ['CLUSTER_ID', 'CLUSTER_SIZE', 'SIMILARITY', 'CLUSTERS_COMPUTED_AT']
+SLOWEST_APPS_MIN_QUERIES = 20
+PAGE_SIZES = [25, 50, 100, 250]
+BASE_URL = "https://app.snowflake.com/sfcogsops/snowhouse_aws_us_west_2/#/streamlit-apps/"
+SNAPSHOT_DIR = os.environ.get('INVENTORY_SNAPSHOT_DIR', os.path.join(tempfile.gettempdir(), 'streamlit_app_inventory_snapshot'))
+SNAPSHOT_STAGE = f"@{INVENTORY_SCHEMA}.STREAMLIT_INVENTORY_SNAPSHOTS"
+SNAPSHOT_MANIFEST = 'manifest.json'
+SNAPSHOT_VERSIONS_MAX_AGE = 300
+USAGE_SNAPSHOT_BUCKET = 28800
+EMBEDDING_MODEL = 'snowflake-arctic-embed-m-v1.5'
+EMBEDDING_QUERY_PREFIX = 'Represent this sentence for searching relevant passages: '
+SEMANTIC_TOP_K = 50
+
+def fetch_snapshot_versions():
+    row = session.sql(f"""
+        SELECT 
+            (SELECT MAX(REFRESHED_AT) FROM {INVENTORY_SCHEMA}.STREAMLIT_APPS_BASE)::STRING || '|' ||
+                COALESCE((SELECT MAX(LOADED_AT) FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_HEALTH_DAILY)::STRING, '') || '|' ||
+                COALESCE((SELECT MAX(COMPUTED_AT) FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_CLUSTERS)::STRING, '') || '|' ||
+                COALESCE((SELECT MAX(EMBEDDED_AT) FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_EMBEDDINGS)::STRING, '') AS INVENTORY_VERSION,
+            COALESCE((SELECT MAX(UPDATED_AT) FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_METADATA)::STRING, '') || '|' ||
+                (SELECT COUNT(*) FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_METADATA)::STRING AS METADATA_VERSION
+    """).collect(statement_params=query_tag('snapshot', 'version_check'))[0]
+    return {'inventory': row['INVENTORY_VERSION'], 'metadata': row['METADATA_VERSION']}
+
+def snapshot_version(versions, name):
+    # Usage views read ACCOUNT_USAGE live, so their snapshots only last for the loader TTL's time bucket
+    if name.startswith('usage_'):
+        return str(int(time.time() // USAGE_SNAPSHOT_BUCKET))
+    return versions['metadata' if name == 'metadata' else 'inventory']
+
+def refresh_snapshot_versions(snapshot):
+    try:
+        versions = fetch_snapshot_versions()
+    except Exception:
+        return None
+    with snapshot['lock']:
+        snapshot['versions'] = versions
+        snapshot['versions_fetched_at'] = time.monotonic()
+    return versions
+
+def snapshot_fingerprint(query, columns):
+    return hashlib.sha256(f"{query}\n{','.join(columns)}".encode()).hexdigest()
+
+@st.cache_resource(show_spinner=False)
+def load_snapshot():
+    snapshot = {'datasets': {}, 'entries': {}, 'served': {}, 'versions': None, 'versions_fetched_at': 0.0, 'lock': threading.Lock()}
+    manifest_path = os.path.join(SNAPSHOT_DIR, SNAPSHOT_MANIFEST)
+    try:
+        if not os.path.exists(manifest_path):
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            session.file.get(f"{SNAPSHOT_STAGE}/", SNAPSHOT_DIR, statement_params=query_tag('snapshot', 'stage_get'))
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        for name, entry in manifest.items():
+            if not isinstance(entry, dict) or not entry.get('fingerprint'):
+                continue
+            snapshot['datasets'][name] = pd.read_parquet(os.path.join(SNAPSHOT_DIR, f"{name}.parquet"))
+            snapshot['entries'][name] = entry
+    except Exception:
+        snapshot['datasets'].clear()
+        snapshot['entries'].clear()
+    if snapshot['datasets']:
+        threading.Thread(target=check_snapshot_versions, args=(snapshot,), daemon=True).start()
+    return snapshot
+
+def check_snapshot_versions(snapshot):
+    current_versions = refresh_snapshot_versions(snapshot)
+    if current_versions is None:
+        return
+    with snapshot['lock']:
+        stale = [name for name, entry in snapshot['entries'].items() if entry['version'] != snapshot_version(current_versions, name)]
+        for name in stale:
+            snapshot['datasets'].pop(name, None)
+            snapshot['entries'].pop(name, None)
+        stale_loaders = {snapshot['served'][name] for name in stale if name in snapshot['served']}
+    for loader in stale_loaders:
+        loader.clear()
+
+def snapshot_matches_query(name, query, entry):
+    try:
+        columns = session.sql(f"SELECT * FROM ({query}) LIMIT 0").to_pandas(statement_params=query_tag('snapshot', 'schema_check', name)).columns
+    except Exception:
+        return False
+    return entry['fingerprint'] == snapshot_fingerprint(query, columns)
+
+def save_snapshot_dataset(snapshot, name, df, entry):
+    try:
+        with snapshot['lock']:
+            if snapshot['entries'].get(name) == entry:
+                return
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            path = os.path.join(SNAPSHOT_DIR, f"{name}.parquet")
+            df.to_parquet(f"{path}.tmp", index=False)
+            os.replace(f"{path}.tmp", path)
+            snapshot['entries'][name] = entry
+            manifest_path = os.path.join(SNAPSHOT_DIR, SNAPSHOT_MANIFEST)
+            with open(f"{manifest_path}.tmp", 'w') as f:
+                json.dump(snapshot['entries'], f)
+            os.replace(f"{manifest_path}.tmp", manifest_path)
+        session.file.put(path, SNAPSHOT_STAGE, auto_compress=False, overwrite=True, statement_params=query_tag('snapshot', 'stage_put', name))
+        session.file.put(manifest_path, SNAPSHOT_STAGE, auto_compress=False, overwrite=True, statement_params=query_tag('snapshot', 'stage_put', name))
+    except Exception:
+        pass
+    # Versions read now precede any later data query, so later saves can reuse them
+    if time.monotonic() - snapshot['versions_fetched_at'] > SNAPSHOT_VERSIONS_MAX_AGE:
+        refresh_snapshot_versions(snapshot)
+
+def snapshot_or_fetch(name, loader, query, component, cache_key=None):
+    snapshot = load_snapshot()
+    with snapshot['lock']:
+        first_load = name not in snapshot['served']
+        snapshot['served'][name] = loader
+        df = snapshot['datasets'].get(name) if first_load else None
+        entry = snapshot['entries'].get(name)
+    if df is not None:
+        if snapshot_matches_query(name, query, entry):
+            return df
+        with snapshot['lock']:
+            snapshot['datasets'].pop(name, None)
+    # Any version read before the data query is safe to save with (an older one only makes the snapshot look stale)
+    with snapshot['lock']:
+        versions = snapshot['versions']
+    if versions is None:
+        versions = refresh_snapshot_versions(snapshot)
+    version = snapshot_version(versions, name) if versions is not None else None
+    df = session.sql(query).to_pandas(statement_params=query_tag(component, 'cache_miss', cache_key))
+    if version is not None:
+        entry = {'version': version, 'fingerprint': snapshot_fingerprint(query, df.columns)}
+        threading.Thread(target=save_snapshot_dataset, args=(snapshot, name, df, entry), daemon=True).start()
+    return df
 
 @st.cache_data(ttl=28800, show_spinner=False)
 def load_apps(ps_only: bool):
     if ps_only:
-        df = session.sql("SELECT * FROM TEMP.OCHOY.STREAMLIT_APPS_PS_ONLY_MAT").to_pandas()
+        return snapshot_or_fetch('apps_ps_only', load_apps, f"SELECT * FROM {INVENTORY_SCHEMA}.STREAMLIT_APPS_PS_ONLY_MAT", 'load_apps', f"ps_only={ps_only}")
     else:
-        df = session.sql("SELECT * FROM TEMP.OCHOY.STREAMLIT_APPS_WITH_ORG_MAT").to_pandas()
-    return df
+        return snapshot_or_fetch('apps_all', load_apps, f"SELECT * FROM {INVENTORY_SCHEMA}.STREAMLIT_APPS_WITH_ORG_MAT", 'load_apps', f"ps_only={ps_only}")
 
 @st.cache_data(ttl=28800, show_spinner=False)
 def load_usage(ps_only: bool):
     if ps_only:
-        return session.sql("SELECT * FROM TEMP.OCHOY.STREAMLIT_APP_USAGE_PS_ONLY").to_pandas()
+        return snapshot_or_fetch('usage_ps_only', load_usage, f"SELECT * FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_USAGE_PS_ONLY", 'load_usage', f"ps_only={ps_only}")
+    else:
+        return snapshot_or_fetch('usage_all', load_usage, f"SELECT * FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_USAGE", 'load_usage', f"ps_only={ps_only}")
+
+@st.cache_data(ttl=28800, show_spinner=False)
+def load_health(ps_only: bool):
+    if ps_only:
+        return snapshot_or_fetch('health_ps_only', load_health, f"SELECT * FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_HEALTH_PS_ONLY", 'load_health', f"ps_only={ps_only}")
     else:
-        return session.sql("SELECT * FROM TEMP.OCHOY.STREAMLIT_APP_USAGE").to_pandas()
+        return snapshot_or_fetch('health_all', load_health, f"SELECT * FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_HEALTH", 'load_health', f"ps_only={ps_only}")
+
+@st.cache_data(ttl=28800, show_spinner=False)
+def load_clusters():
+    return snapshot_or_fetch('clusters', load_clusters, f"SELECT LOCATION, CLUSTER_ID, CLUSTER_SIZE, SIMILARITY, COMPUTED_AT FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_CLUSTERS", 'load_clusters')
 
 @st.cache_data(ttl=60, show_spinner=False)
 def load_metadata():
-    return session.sql("SELECT * FROM TEMP.OCHOY.STREAMLIT_APP_METADATA").to_pandas()
+    return snapshot_or_fetch('metadata', load_metadata, f"SELECT * FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_METADATA", 'load_metadata')
+
+@st.cache_resource(ttl=28800, show_spinner=False)
+def load_user_directory():
+    df = snapshot_or_fetch('user_directory', load_user_directory, f"SELECT NAME, DISPLAY_NAME, SF_NAME FROM {INVENTORY_SCHEMA}.STREAMLIT_USER_DIRECTORY", 'load_user_directory')
+    df = df.dropna(subset=['NAME']).drop_duplicates('NAME').set_index('NAME')
+    return {'by_name': df.to_dict('index')}
+
+user_directory = load_user_directory()
+
+def to_vector(value):
+    return np.asarray(json.loads(value) if isinstance(value, str) else value, dtype=np.float32)
+
+@st.cache_resource(ttl=28800, show_spinner=False)
+def load_embeddings():
+    df = snapshot_or_fetch('embeddings', load_embeddings, f"SELECT LOCATION, EMBEDDING, EMBEDDED_AT FROM {INVENTORY_SCHEMA}.STREAMLIT_APP_EMBEDDINGS", 'load_embeddings')
+    matrix = np.zeros((len(df), 0), dtype=np.float32) if df.empty else np.stack([to_vector(value) for value in df['EMBEDDING']])
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    return {
+        'index': pd.Series(np.arange(len(df)), index=df['LOCATION']),
+        'matrix': np.ascontiguousarray(matrix),
+        'embedded_at': df['EMBEDDED_AT'].max() if not df.empty else None,
+    }
+
+@st.cache_data(ttl=28800, max_entries=512, show_spinner=False)
+def embed_query(query: str):
+    row = session.sql(
+        "SELECT SNOWFLAKE.CORTEX.EMBED_TEXT_768(?, ?) AS EMBEDDING", params=[EMBEDDING_MODEL, EMBEDDING_QUERY_PREFIX + query]
+    ).collect(statement_params=query_tag('embed_query', 'cache_miss', hashlib.sha256(query.encode()).hexdigest()[:16]))[0]
+    vector = to_vector(row['EMBEDDING'])
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+def keyword_search(df, query):
+    query_lower = query.lower()
+    return df[
+        df['TITLE'].str.lower().str.contains(query_lower, na=False, regex=False) |
+        df['NAME'].str.lower().str.contains(query_lower, na=False, regex=False) |
+        df['LOCATION'].str.lower().str.contains(query_lower, na=False, regex=False)
+    ].index
+
+def semantic_search(df, query, k=SEMANTIC_TOP_K):
+    embeddings = load_embeddings()
+    rows = df['LOCATION'].map(embeddings['index']).dropna().astype(int)
+    # Apps added since the last embedding run (or all apps before the first backfill) can still match by keyword
+    unembedded = keyword_search(df[~df.index.isin(rows.index)], query)
+    if rows.empty:
+        return unembedded, len(df)
+    scores = embeddings['matrix'][rows.to_numpy()] @ embed_query(query)
+    top = np.argpartition(-scores, k)[:k] if len(scores) > k else np.arange(len(scores))
+    return rows.index[top[np.argsort(-scores[top], kind='stable')]].append(unembedded), len(df) - len(rows)
 
-@st.cache_data(ttl=3600, show_spinner=False)
 def get_user_display_name(username: str):
-    result = session.sql(f"SELECT DISPLAY_NAME FROM SNOWFLAKE.ACCOUNT_USAGE.USERS WHERE NAME = '{username}' AND DELETED_ON IS NULL LIMIT 1").to_pandas()
-    if not result.empty:
-        return result['DISPLAY_NAME'].values[0]
+    user = user_directory['by_name'].get(username)
+    if user and pd.notna(user['DISPLAY_NAME']):
+        return user['DISPLAY_NAME']
     return None
 
 def save_metadata(location, description, category, status):
     session.sql(f"""
-        MERGE INTO TEMP.OCHOY.STREAMLIT_APP_METADATA t
+        MERGE INTO {INVENTORY_SCHEMA}.STREAMLIT_APP_METADATA t
         USING (SELECT '{location}' AS LOCATION) s
         ON t.LOCATION = s.LOCATION
         WHEN MATCHED THEN UPDATE SET 
@@ -49,7 +283,7 @@ def save_metadata(location, description, category, status):
             UPDATED_AT = CURRENT_TIMESTAMP()
         WHEN NOT MATCHED THEN INSERT (LOCATION, DESCRIPTION, CATEGORY, STATUS, UPDATED_BY, UPDATED_AT)
             VALUES ('{location}', '{description.replace("'", "''")}', '{category}', '{status}', '{current_user}', CURRENT_TIMESTAMP())
-    """).collect()
+    """).collect(statement_params=query_tag('save_metadata', 'write', location))
     st.cache_data.clear()
 
 current_user_display_name = get_user_display_name(current_user)
@@ -73,6 +307,72 @@ def extract_org_leaders(df):
         leaders.update([p.strip() for p in parts if p.strip()])
     return sorted(list(leaders))
 
+def dataset_version(df_apps, df_metadata, ps_only: bool, embedded_at):
+    refreshed_at = df_apps['REFRESHED_AT'].max() if 'REFRESHED_AT' in df_apps.columns else None
+    metadata_updated_at = df_metadata['UPDATED_AT'].max() if not df_metadata.empty else None
+    health_loaded_at = df_apps['HEALTH_LOADED_AT'].max()
+    clusters_computed_at = df_apps['CLUSTERS_COMPUTED_AT'].max()
+    return f"{ps_only}|{len(df_apps)}|{refreshed_at}|{len(df_metadata)}|{metadata_updated_at}|{health_loaded_at}|{clusters_computed_at}|{embedded_at}"
+
+@st.cache_data(ttl=28800, max_entries=8, show_spinner=False)
+def compute_dataset_aggregates(_df_apps, version: str):
+    weeks = pd.to_datetime(_df_apps['CREATED_ON']).dt.to_period('W').dt.start_time
+    one_year_ago = pd.Timestamp.now() - pd.DateOffset(years=1)
+    weekly_counts = weeks[weeks >= one_year_ago].value_counts().sort_index().rename_axis('WEEK').to_frame('Apps')
+    return {
+        'weekly_counts': weekly_counts,
+        'with_creator': int(_df_apps['CREATED_BY_USER'].notna().sum()),
+        'with_org': int(_df_apps['ORG_HIERARCHY'].notna().sum()),
+        'org_leaders': extract_org_leaders(_df_apps),
+        'managers': sorted(_df_apps['MANAGER_NAME'].dropna().unique().tolist()),
+        'owner_roles': sorted(_df_apps['OWNER_ROLE'].dropna().unique().tolist()),
+        'creators': sorted(_df_apps['CREATED_BY_USER'].dropna().unique().tolist()),
+        'databases': sorted(_df_apps['DATABASE_NAME'].dropna().unique().tolist()),
+    }
+
+@st.cache_data(ttl=28800, max_entries=128, show_spinner=False)
+def compute_filtered_aggregates(_df_filtered, version: str, filter_key: tuple):
+    status = _df_filtered['STATUS'].fillna('').replace('', 'Not Set')
+    clustered = _df_filtered[_df_filtered['CLUSTER_SIZE'] > 1]
+    return {
+        'with_creator': int(_df_filtered['CREATED_BY_USER'].notna().sum()),
+        'db_counts': _df_filtered['DATABASE_NAME'].value_counts().head(15),
+        'mgr_counts': _df_filtered['MANAGER_NAME'].value_counts().head(15),
+        'status_counts': status.value_counts(),
+        'top_clusters': clustered.groupby('CLUSTER_ID').agg(**{'In View': ('LOCATION', 'size'), 'Copies': ('CLUSTER_SIZE', 'max')})
+            .sort_values(['Copies', 'In View'], ascending=False).head(15),
+    }
+
+@st.cache_data(ttl=28800, max_entries=8, show_spinner=False)
+def compute_sort_orders(_df_apps, version: str):
+    orders = {}
+    for label, column in SORT_COLUMNS.items():
+        values = _df_apps[column]
+        if column == 'TITLE':
+            values = values.where(values.fillna('').str.strip() != '', _df_apps['NAME'])
+        if values.dtype == object:
+            values = values.str.lower()
+        for ascending in (True, False):
+            orders[(label, ascending)] = values.sort_values(ascending=ascending, na_position='last', kind='stable').index
+    return orders
+
+def build_display_df(df):
+    display_df = df[[
+        'TITLE', 'NAME', 'LOCATION', 'LAST_UPDATED_TIME', 
+        'CREATED_BY_USER', 'CREATOR_FULL_NAME', 'MANAGER_NAME',
+        'OWNER_ROLE', 'DATABASE_NAME', 'CATEGORY', 'STATUS', 'DESCRIPTION',
+        'ERROR_RATE_PCT', 'P95_ELAPSED_MS', 'CLUSTER_SIZE', 'CAN_EDIT'
+    ]].copy()
+
+    display_df['APP_URL'] = BASE_URL + display_df['LOCATION']
+    display_df['TITLE'] = display_df['TITLE'].where(display_df['TITLE'].fillna('').str.strip() != '', display_df['NAME'])
+    display_df['Edit'] = display_df['CAN_EDIT'].apply(lambda x: '✏️' if x else '')
+    display_df['LINK_TEXT'] = 'Go to App'
+    display_df = display_df.drop(columns=['NAME', 'CAN_EDIT'])
+
+    display_df.columns = ['Title', 'Location', 'Last Updated', 'Creator', 'Creator Name', 'Manager', 'Owner Role', 'Database', 'Category', 'Status', 'Description', 'Error %', 'P95 Latency', 'Copies', 'App URL', 'Edit', 'Link Text']
+    return display_df
+
 with st.sidebar.expander("Team Filter", expanded=True):
     ps_only = st.toggle("PS/SD Apps Only", value=True, help="Show only apps created by Professional Services team")
 
@@ -99,18 +399,36 @@ if df_apps.empty:
     st.stop()
 
 df_usage = load_usage(ps_only)
+df_health = load_health(ps_only)
 
-col_chart1, col_chart2 = st.columns(2)
+if not df_health.empty:
+    df_apps = df_apps.merge(
+        df_health.rename(columns={'STREAMLIT_FQN': 'LOCATION', 'LOADED_AT': 'HEALTH_LOADED_AT'})[['LOCATION'] + HEALTH_COLUMNS],
+        on='LOCATION', how='left'
+    )
+else:
+    for column in HEALTH_COLUMNS:
+        df_apps[column] = None
+
+df_clusters = load_clusters()
+
+if not df_clusters.empty:
+    df_apps = df_apps.merge(
+        df_clusters.rename(columns={'COMPUTED_AT': 'CLUSTERS_COMPUTED_AT'})[['LOCATION'] + CLUSTER_COLUMNS],
+        on='LOCATION', how='left'
+    )
+else:
+    for column in CLUSTER_COLUMNS:
+        df_apps[column] = None
+
+data_version = dataset_version(df_apps, df_metadata, ps_only, load_embeddings()['embedded_at'])
+aggregates = compute_dataset_aggregates(df_apps, data_version)
+
+col_chart1, col_chart2, col_chart3 = st.columns(3)
 
 with col_chart1:
     st.subheader("Apps Created Per Week")
-    df_weekly = df_apps.copy()
-    df_weekly['WEEK'] = pd.to_datetime(df_weekly['CREATED_ON']).dt.to_period('W').dt.start_time
-    one_year_ago = pd.Timestamp.now() - pd.DateOffset(years=1)
-    df_weekly = df_weekly[df_weekly['WEEK'] >= one_year_ago]
-    weekly_counts = df_weekly.groupby('WEEK').size().reset_index(name='Apps')
-    weekly_counts = weekly_counts.set_index('WEEK')
-    st.bar_chart(weekly_counts, height=250)
+    st.bar_chart(aggregates['weekly_counts'], height=250)
 
 with col_chart2:
     st.subheader("Top 10 Most Used Apps (90 days)")
@@ -132,6 +450,19 @@ with col_chart2:
         st.info("No usage data available")
         selected_top_app = ""
 
+with col_chart3:
+    st.subheader("Slowest Apps (p95, 90 days)")
+    slow_apps = df_health[df_health['QUERY_COUNT'] >= SLOWEST_APPS_MIN_QUERIES] if not df_health.empty else df_health
+    if not slow_apps.empty:
+        slowest10 = slow_apps.nlargest(10, 'P95_ELAPSED_MS')[['STREAMLIT_FQN', 'P95_ELAPSED_MS']].copy()
+        slowest10['APP'] = slowest10['STREAMLIT_FQN'].str.split('.').str[-1]
+        slowest10 = slowest10.sort_values('P95_ELAPSED_MS', ascending=True)
+        chart_data = slowest10.set_index('APP')[['P95_ELAPSED_MS']]
+        chart_data.columns = ['p95 ms']
+        st.bar_chart(chart_data, height=250, horizontal=True)
+    else:
+        st.info("No health data available")
+
 st.markdown("---")
 
 with st.sidebar.expander("Filter Apps", expanded=True):
@@ -142,30 +473,27 @@ with st.sidebar.expander("Filter Apps", expanded=True):
     )
 
     if filter_type == "Organization":
-        org_leaders = extract_org_leaders(df_apps)
-        selected = st.selectbox("Select Organization Leader", options=["All"] + org_leaders)
+        selected = st.selectbox("Select Organization Leader", options=["All"] + aggregates['org_leaders'])
         if selected != "All":
             df_filtered = df_apps[df_apps['ORG_HIERARCHY'].str.contains(selected, na=False, regex=False)].copy()
         else:
             df_filtered = df_apps.copy()
 
     elif filter_type == "Direct Manager":
-        managers = sorted(df_apps['MANAGER_NAME'].dropna().unique().tolist())
-        selected = st.selectbox("Select Direct Manager", options=["All"] + managers)
+        selected = st.selectbox("Select Direct Manager", options=["All"] + aggregates['managers'])
         if selected != "All":
             df_filtered = df_apps[df_apps['MANAGER_NAME'] == selected].copy()
         else:
             df_filtered = df_apps.copy()
 
     elif filter_type == "Owner Role":
-        options = sorted(df_apps['OWNER_ROLE'].dropna().unique().tolist())
+        options = aggregates['owner_roles']
         default_idx = options.index('TECHNICAL_ACCOUNT_MANAGER') if 'TECHNICAL_ACCOUNT_MANAGER' in options else 0
         selected = st.selectbox("Select Owner Role", options=options, index=default_idx)
         df_filtered = df_apps[df_apps['OWNER_ROLE'] == selected].copy()
 
     elif filter_type == "Creator":
-        creators = sorted(df_apps['CREATED_BY_USER'].dropna().unique().tolist())
-        selected = st.selectbox("Select Creator", options=["All"] + creators)
+        selected = st.selectbox("Select Creator", options=["All"] + aggregates['creators'])
         if selected != "All":
             df_filtered = df_apps[df_apps['CREATED_BY_USER'] == selected].copy()
         else:
@@ -192,33 +520,40 @@ with st.sidebar.expander("Filter Apps", expanded=True):
             df_filtered = df_apps[df_apps['STATUS'] == selected].copy()
 
     else:
-        options = sorted(df_apps['DATABASE_NAME'].dropna().unique().tolist())
-        selected = st.selectbox("Select Database", options=options)
+        selected = st.selectbox("Select Database", options=aggregates['databases'])
         df_filtered = df_apps[df_apps['DATABASE_NAME'] == selected].copy()
 
     search_term = st.text_input("Search within results", placeholder="Search by title, name...")
-
-if search_term:
-    search_lower = search_term.lower()
-    df_filtered = df_filtered[
-        df_filtered['TITLE'].str.lower().str.contains(search_lower, na=False) |
-        df_filtered['NAME'].str.lower().str.contains(search_lower, na=False) |
-        df_filtered['LOCATION'].str.lower().str.contains(search_lower, na=False)
-    ]
+    semantic = st.toggle("Semantic search", value=False, help="Match apps that do what you describe, using title and description embeddings")
+
+relevance_order = None
+if search_term and semantic:
+    relevance_order, unembedded_count = semantic_search(df_filtered, search_term)
+    if unembedded_count == len(df_filtered):
+        st.sidebar.info("No embeddings yet for these apps, so results are keyword matches.")
+    elif unembedded_count:
+        st.sidebar.caption(f"{unembedded_count:,} apps have no embedding yet; they are matched by keyword and listed last.")
+    df_filtered = df_filtered.loc[relevance_order]
+elif search_term:
+    df_filtered = df_filtered.loc[keyword_search(df_filtered, search_term)]
 
 if selected_top_app:
     df_filtered = df_apps[df_apps['LOCATION'] == selected_top_app].copy()
 
+filtered_aggregates = compute_filtered_aggregates(df_filtered, data_version, (filter_type, selected, search_term, semantic, selected_top_app))
+
 with st.sidebar.expander("Stats & Actions", expanded=False):
     if ps_only:
         st.caption(f"PS/SD apps: {len(df_apps):,}")
     else:
         st.caption(f"Total apps in account: {len(df_apps):,}")
-    st.caption(f"With creator info: {df_apps['CREATED_BY_USER'].notna().sum():,}")
-    st.caption(f"With org info: {df_apps['ORG_HIERARCHY'].notna().sum():,}")
+    st.caption(f"With creator info: {aggregates['with_creator']:,}")
+    st.caption(f"With org info: {aggregates['with_org']:,}")
 
     if st.button("Clear Cache & Reload"):
         st.cache_data.clear()
+        load_user_directory.clear()
+        load_embeddings.clear()
         st.rerun()
 
 col1, col2, col3 = st.columns(3)
@@ -236,8 +571,7 @@ else:
     with col2:
         st.metric("Apps Found", len(df_filtered))
     with col3:
-        with_creator = len(df_filtered[df_filtered['CREATED_BY_USER'].notna()])
-        st.metric("With Creator Info", with_creator)
+        st.metric("With Creator Info", filtered_aggregates['with_creator'])
 
 st.markdown("---")
 
@@ -248,6 +582,7 @@ with st.expander("ℹ️ About this data", expanded=False):
 - Creator info from `ACCOUNT_USAGE.ACCESS_HISTORY` (tracks who first created each app)
 - Org hierarchy from `ACCOUNT_USAGE.USERS` (maps creators to their management chain)
 - Usage metrics from `ACCOUNT_USAGE.QUERY_HISTORY` (EXECUTE_STREAMLIT events)
+- Health metrics (error rate, p95 latency) from `QUERY_HISTORY` rows tagged with each app's `StreamlitName`, rolled up daily
 
 **Known Limitations:**
 - **Last Updated**: Only populated for apps modified within the ACCESS_HISTORY retention window (~1 year). Older apps may show blank.
@@ -255,26 +590,37 @@ with st.expander("ℹ️ About this data", expanded=False):
 - Telemetry data was evaluated but ACCESS_HISTORY provides more reliable creator attribution.
     """)
 
-df_filtered['CAN_EDIT'] = df_filtered.apply(can_edit, axis=1)
+df_filtered['CAN_EDIT'] = df_filtered.apply(can_edit, axis=1, result_type='reduce').astype(bool)
+
+col_sort, col_order, col_size, col_page = st.columns(4)
+with col_sort:
+    sort_label = st.selectbox("Sort by", options=(["Relevance"] if relevance_order is not None else []) + list(SORT_COLUMNS))
+with col_order:
+    sort_descending = st.toggle("Descending", value=True)
+with col_size:
+    page_size = st.selectbox("Rows per page", options=PAGE_SIZES + ["All"], index=1)
 
-display_df = df_filtered[[
-    'TITLE', 'NAME', 'LOCATION', 'LAST_UPDATED_TIME', 
-    'CREATED_BY_USER', 'CREATOR_FULL_NAME', 'MANAGER_NAME',
-    'OWNER_ROLE', 'DATABASE_NAME', 'CATEGORY', 'STATUS', 'DESCRIPTION', 'CAN_EDIT'
-]].copy()
+if sort_label == "Relevance":
+    sort_order = relevance_order[relevance_order.isin(df_filtered.index)]
+    sort_order = sort_order if sort_descending else sort_order[::-1]
+else:
+    sort_order = compute_sort_orders(df_apps, data_version)[(sort_label, not sort_descending)]
+    sort_order = sort_order[sort_order.isin(df_filtered.index)]
 
-base_url = "https://app.snowflake.com/sfcogsops/snowhouse_aws_us_west_2/#/streamlit-apps/"
-display_df['APP_URL'] = base_url + display_df['LOCATION']
-display_df['TITLE'] = display_df.apply(lambda row: row['TITLE'] if row['TITLE'] and row['TITLE'].strip() else row['NAME'], axis=1)
-display_df['Edit'] = display_df['CAN_EDIT'].apply(lambda x: '✏️' if x else '')
-display_df['LINK_TEXT'] = 'Go to App'
-display_df = display_df.drop(columns=['NAME', 'CAN_EDIT'])
+if page_size == "All":
+    page_order = sort_order
+    with col_page:
+        st.caption(f"{len(sort_order):,} apps")
+else:
+    page_count = max(1, -(-len(sort_order) // page_size))
+    with col_page:
+        page = st.number_input(f"Page (of {page_count:,})", min_value=1, max_value=page_count, value=1, step=1)
+    page_order = sort_order[(page - 1) * page_size:page * page_size]
 
-display_df.columns = ['Title', 'Location', 'Last Updated', 'Creator', 'Creator Name', 'Manager', 'Owner Role', 'Database', 'Category', 'Status', 'Description', 'App URL', 'Edit', 'Link Text']
-display_df = display_df.sort_values('Last Updated', ascending=False, na_position='last')
+display_df = build_display_df(df_filtered.loc[page_order])
 
 st.dataframe(
-    display_df[['Edit', 'Title', 'Description', 'App URL', 'Last Updated', 'Creator', 'Creator Name', 'Manager', 'Status']],
+    display_df[['Edit', 'Title', 'Description', 'App URL', 'Last Updated', 'Creator', 'Creator Name', 'Manager', 'Status', 'Error %', 'P95 Latency', 'Copies']],
     use_container_width=True,
     hide_index=True,
     column_config={
@@ -287,10 +633,14 @@ st.dataframe(
         "Creator Name": st.column_config.TextColumn("Creator Name", width="medium"),
         "Manager": st.column_config.TextColumn("Manager", width="medium"),
         "Status": st.column_config.TextColumn("Status", width="small"),
+        "Error %": st.column_config.NumberColumn("Error %", format="%.1f%%", width="small"),
+        "P95 Latency": st.column_config.NumberColumn("P95 Latency", format="%.0f ms", width="small"),
+        "Copies": st.column_config.NumberColumn("Copies", format="%d", width="small", help="Apps with near-duplicate source code, including this one"),
     }
 )
 
-editable_apps = display_df[display_df['Edit'] == '✏️']['Location'].tolist()
+df_sorted = df_filtered.loc[sort_order]
+editable_apps = df_sorted[df_sorted['CAN_EDIT']]['LOCATION'].tolist()
 if editable_apps:
     st.markdown("---")
     edit_app_location = st.selectbox(
@@ -301,7 +651,7 @@ if editable_apps:
     
     if edit_app_location:
         app_row = df_filtered[df_filtered['LOCATION'] == edit_app_location].iloc[0]
-        app_display = display_df[display_df['Location'] == edit_app_location].iloc[0]
+        app_display = build_display_df(df_filtered[df_filtered['LOCATION'] == edit_app_location]).iloc[0]
         
         with st.container(border=True):
             st.subheader(f"📝 Edit Metadata: {app_display['Title']}")
@@ -338,16 +688,51 @@ if editable_apps:
                 st.rerun()
 
 with st.expander("Apps by Database"):
-    db_counts = df_filtered['DATABASE_NAME'].value_counts().head(15)
-    st.bar_chart(db_counts)
+    st.bar_chart(filtered_aggregates['db_counts'])
 
 with st.expander("Apps by Manager"):
-    mgr_counts = df_filtered['MANAGER_NAME'].value_counts().head(15)
-    if not mgr_counts.empty:
-        st.bar_chart(mgr_counts)
+    if not filtered_aggregates['mgr_counts'].empty:
+        st.bar_chart(filtered_aggregates['mgr_counts'])
     else:
         st.info("No manager data available for filtered apps")
 
+with st.expander("Apps by Status"):
+    st.bar_chart(filtered_aggregates['status_counts'])
+
+with st.expander("Similar Apps"):
+    if not filtered_aggregates['top_clusters'].empty:
+        st.caption("Largest clusters of near-duplicate apps (by source code) among the filtered apps")
+        st.dataframe(filtered_aggregates['top_clusters'].rename_axis('Original'), use_container_width=True)
+        
+        similar_app = st.selectbox(
+            "Select app to find similar apps",
+            options=[""] + sorted(df_filtered.loc[df_filtered['CLUSTER_SIZE'] > 1, 'LOCATION'].tolist()),
+            format_func=lambda x: "Select an app..." if x == "" else x,
+            key="similar_app_select"
+        )
+        if similar_app:
+            cluster_id = df_filtered.loc[df_filtered['LOCATION'] == similar_app, 'CLUSTER_ID'].values[0]
+            similar_df = df_clusters[(df_clusters['CLUSTER_ID'] == cluster_id) & (df_clusters['LOCATION'] != similar_app)].merge(
+                df_apps[['LOCATION', 'TITLE', 'CREATED_BY_USER', 'LAST_UPDATED_TIME']], on='LOCATION', how='left'
+            ).sort_values('SIMILARITY', ascending=False)
+            similar_df['SIMILARITY'] = similar_df['SIMILARITY'] * 100
+            similar_df['APP_URL'] = BASE_URL + similar_df['LOCATION']
+            st.dataframe(
+                similar_df[['LOCATION', 'TITLE', 'CREATED_BY_USER', 'LAST_UPDATED_TIME', 'SIMILARITY', 'APP_URL']],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "LOCATION": st.column_config.TextColumn("Location", width="medium"),
+                    "TITLE": st.column_config.TextColumn("App Title", width="medium"),
+                    "CREATED_BY_USER": st.column_config.TextColumn("Creator", width="small"),
+                    "LAST_UPDATED_TIME": st.column_config.DatetimeColumn("Last Updated", format="YYYY-MM-DD HH:mm"),
+                    "SIMILARITY": st.column_config.NumberColumn("Similarity to Original", format="%.0f%%", width="small"),
+                    "APP_URL": st.column_config.LinkColumn("Link", display_text="Go to App", width="small"),
+                }
+            )
+    else:
+        st.info("No near-duplicate apps among the filtered apps")
+
 if current_user == 'OCHOY':
     st.markdown("---")
     st.subheader("Admin: AI Description Generator")
@@ -369,7 +754,7 @@ if current_user == 'OCHOY':
         
         if st.button("Generate AI Description", type="primary", key="gen_ai_btn"):
             with st.spinner("Analyzing app code with Cortex AI..."):
-                result = session.call("TEMP.OCHOY.GENERATE_APP_DESCRIPTION", ai_selected_app)
+                result = session.call(f"{INVENTORY_SCHEMA}.GENERATE_APP_DESCRIPTION", ai_selected_app, statement_params=query_tag('generate_description', 'admin', ai_selected_app))
             
             if result.startswith("Error:"):
                 st.error(result)